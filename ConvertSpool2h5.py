@@ -128,7 +128,8 @@ def converter(p):
             for i, fn in enumerate(flist2):
                 fn = Path(path.parent / fn)
                 P["spoolfn"] = fn
-                imgs, ticks, tsec = readNeoSpool(fn, P, zerocols=p.zerocols)
+                # every frame, blank or not: vid2h5 places file i at i * nframefile
+                imgs, ticks, tsec = readNeoSpool(fn, P, range(P["nframefile"]), zerocols=p.zerocols)
                 vid2h5(imgs, None, None, ticks, outfn, P, i, len(flist2), det, tstart)
         else:
             print("writing metadata")
@@ -55,7 +55,7 @@ def plotspool(path, kinetic, tstart):
         imgs, ticks, tsec = readNeoSpool(f, P)
 
         if PL:
-            for j in range(P["nframefile"]):
+            for j in range(imgs.shape[0]):  # trailing blank frames were dropped
                 hi.set_data(imgs[j, ...])
                 ttxt = f"{f.name}\ntick: {ticks[j]} "
                 if tsec is not None:
@@ -1,27 +1,31 @@
 from __future__ import annotations
+import os
+import errno
+import struct
+import threading
 from pathlib import Path
 from tempfile import mkstemp
 from time import time, sleep
 import logging
-from configparser import ConfigParser
-from datetime import datetime
-from pytz import UTC
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import lru_cache, partial
+from importlib.util import find_spec
+from multiprocessing import get_context
+from datetime import datetime, timezone
 import numpy as np
-import imageio
-import h5py
-import pandas
-from typing import Any
-
-try:
-    import cv2
-except ImportError:
-    cv2 = None  # fall back to imageio, no time annotation
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import h5py
+    import pandas
 #
-from . import mean16to8
-from histutils import setupimgh5
-from histutils.timedmc import frame2ut1
+from . import mean16to8, _accdtype, _mean_scale_kernel
 
 DTYPE = np.uint16
+RING_DEPTH = 256  # number of spool files per io_uring submission
+NOURING = (-errno.EINVAL, -errno.EOPNOTSUPP, -errno.ENOSYS)  # io_uring op unsupported
+TICK = struct.Struct("<Q")  # FPGA tick, little endian uint64
+_READERS: dict[tuple[int, int, int, int], Any] = {}  # make_reader() cache
 
 
 def preview_newest(
@@ -34,6 +38,8 @@ def preview_newest(
     root = Path(path).expanduser()
 
     if (root / "image.bmp").is_file():
+        import imageio
+
         f8bit = imageio.imread(root / "image.bmp")  # TODO check for 8 bit
     elif root.is_dir():  # spool case
         # %% find newest file to extract images from
@@ -43,9 +49,13 @@ def preview_newest(
         # %% read images and FPGA tick clock from this file
         P = spoolparam(newfn.parent / inifn)
         sleep(0.5)  # to avoid reading newest file while it's still being written
-        frames, ticks, tsec = readNeoSpool(newfn, P)
         # %% 16 bit to 8 bit, mean of image stack for this file
-        f8bit = mean16to8(frames)
+        if _mean_scale_kernel() is not None:  # Numba: mean & scale in one pass over the file
+            imgs, ticks, tsec = readNeoSpool(newfn, P)  # memory-mapped views, not read yet
+            f8bit = mean16to8(imgs)
+        else:  # stream the mean frame by frame
+            fmean, ticks, tsec = readNeoSpool(newfn, P, reduce="mean")
+            f8bit = mean16to8(fmean)
     else:
         raise ValueError(f"unknown image file/location {root}")
 
@@ -64,11 +74,12 @@ def findnewest(path: Path, oldset: set = None, verbose: bool = False):
     if path.is_file():
         return path
     # %% it's a directory
-    newset = set(path.glob("*.dat"))
+    entries = {Path(e.path): e for e in _spoolfiles(path)}
+    newset = set(entries)
     if not newset:
         raise FileNotFoundError(f"no files found in {path}")
 
-    fset = newset.symmetric_difference(oldset) if oldset is not None else newset
+    fset = newset - oldset if oldset is not None else newset
     if not fset:
         logging.warning(f"no new files found in {path}")
         return None, set()
@@ -78,27 +89,41 @@ def findnewest(path: Path, oldset: set = None, verbose: bool = False):
 
     # max(fl2,key=getmtime)                             # 9.2us per loop, 8.1 time cache Py3.5,  # 6.2us per loop, 18 times cache  Py27
     # max((str(f) for f in flist), key=getmtime)         # 13us per loop, 20 times cache, # 10.1us per loop, no cache Py27
-    newest = max(
-        fset, key=lambda f: f.stat().st_mtime
-    )  # 14.8us per loop, 7.5times cache, # 10.3us per loop, 21 times cache Py27
+    # max(fset, key=lambda f: f.stat().st_mtime)        # 14.8us per loop, 7.5times cache, # 10.3us per loop, 21 times cache Py27
+    # DirEntry.stat() is cached, and free on Windows
+    newest = max(fset, key=lambda f: entries[f].stat().st_mtime)
 
     if verbose:
-        print(f"newest file {newest}  {newest.stat().st_mtime}")
+        print(f"newest file {newest}  {entries[newest].stat().st_mtime}")
 
     return newest, newset
 
 
+def _spoolfiles(path: Path) -> list[os.DirEntry]:
+    """
+    spool files in directory, sorted by name, from one directory read
+    """
+    with os.scandir(path) as it:
+        entries = [e for e in it if e.name.endswith(".dat") and e.is_file()]
+    entries.sort(key=lambda e: e.name)
+
+    return entries
+
+
 def spoolpath(path: Path):
     path = Path(path).expanduser()
 
     if path.is_dir():
-        flist = sorted(path.glob("*.dat"))  # list of spool files in this directory
+        flist = [Path(e.path) for e in _spoolfiles(path)]  # spool files in this directory
     elif path.is_file():
         if path.suffix == ".h5":  # tick file we wrote putting filename in time order
+            import h5py
+
             with h5py.File(path, "r", libver="latest") as f:
-                F = f["fn"][:].astype(str)  # pathlib doesn't want bytes
-                P = Path(f["path"][()])
-            flist = [P / f for f in F]
+                # one read of all names; pathlib doesn't want bytes
+                names = f["fn"].asstr()[:]
+                root = Path(f["path"].asstr()[()])
+            flist = [root / n for n in names]
         else:
             flist = [path]
     else:
@@ -109,6 +134,35 @@ def spoolpath(path: Path):
     return flist
 
 
+def _parse_ini(inifn: Path) -> dict[str, dict[str, str]]:
+    """
+    sibling spool files share one .ini, so parse once per (path, mtime).
+    The returned dict is shared between callers: do not modify it.
+    """
+    inifn = Path(inifn).resolve()
+    return _parse_ini_cached(str(inifn), inifn.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _parse_ini_cached(inifn: str, mtime_ns: int) -> dict[str, dict[str, str]]:
+    """
+    minimal reader of the small Solis .ini: {section: {key: value}}.
+    Keys are lower case, as with ConfigParser.
+    'utf-8-sig' is required for Andor's weird Windows format
+    """
+    C: dict[str, dict[str, str]] = {}
+    sec = C.setdefault("", {})
+    for line in Path(inifn).read_text(encoding="utf-8-sig").splitlines():
+        line = line.strip()
+        if line.startswith("[") and line.endswith("]"):
+            sec = C.setdefault(line[1:-1].strip(), {})
+        elif "=" in line and not line.startswith((";", "#")):
+            k, v = line.split("=", 1)
+            sec[k.strip().lower()] = v.strip()
+
+    return C
+
+
 def spoolparam(
     inifn: Path, superx: int = None, supery: int = None, stride: int = None
 ) -> dict[str, Any]:
@@ -117,25 +171,25 @@ def spoolparam(
     if not inifn.is_file():
         raise FileNotFoundError(f"{inifn} does not exist.")
     # %% parse Solis acquisitionmetadata.ini that's autogenerated for each Kinetic series
-    C = ConfigParser()
-    C.read(inifn, encoding="utf-8-sig")  # 'utf-8-sig' is required for Andor's weird Windows format
+    C = _parse_ini(inifn)
+    D = C["data"]
 
-    Nframe = C.getint("multiimage", "ImagesPerFile")
+    Nframe = int(C["multiimage"]["imagesperfile"])
 
-    if "ImageSizeBytes" in C["data"]:  # 2016-present format
-        framebytes = C.getint("data", "ImageSizeBytes")  # including all headers & zeros
-        superx = C.getint("data", "AOIWidth")
-        supery = C.getint("data", "AOIHeight")
-        stride = C.getint("data", "AOIStride")
+    if "imagesizebytes" in D:  # 2016-present format
+        framebytes = int(D["imagesizebytes"])  # including all headers & zeros
+        superx = int(D["aoiwidth"])
+        supery = int(D["aoiheight"])
+        stride = int(D["aoistride"])
 
-        encoding = C.get("data", "PixelEncoding")
+        encoding = D["pixelencoding"]
 
         if encoding not in ("Mono32", "Mono16"):
             logging.critical("Spool File may not be read correctly, unexpected format")
 
         bpp = int(encoding[-2:])
-    elif "ImageSize" in C["data"]:  # 2012-201? format
-        framebytes = C.getint("data", "ImageSize")
+    elif "imagesize" in D:  # 2012-201? format
+        framebytes = int(D["imagesize"])
         assert isinstance(superx, int) and isinstance(supery, int)
         # TODO arbitrary sanity check.
         if superx * supery * 2 < 0.9 * framebytes or superx * supery * 2 > 0.999 * framebytes:
@@ -157,7 +211,94 @@ def spoolparam(
     return P
 
 
-def readNeoSpool(fn: Path, P: dict, ifrm=None, tickonly: bool = False, zerocols: int = 0):
+def _spooldtype(P: dict, dtype, zerocols: int = 0) -> np.dtype:
+    """
+    layout of one spool frame: image rows (pixels, then any zero columns),
+    then footer with FPGA tick. ["img"]["pix"] is the image without zero columns.
+    """
+    row = [("pix", dtype, P["superx"])]
+    if zerocols:
+        row.append(("pad", dtype, zerocols))
+
+    return np.dtype([("img", row, P["supery"]), ("hdr", "<u8", P["stride"] // 8)])
+
+
+def make_reader(nx: int, ny: int, zerocols: int, stride: int):
+    """
+    returns Numba function read(buf, ifrm, imgs, ticks) copying frames "ifrm",
+    without zero columns, and their FPGA tick out of spool words buf[Nframefile, words].
+
+    Frame shape and footer layout are constant for a whole experiment, so they are
+    compiled in (closure constants), letting Numba unroll and vectorize the copies.
+    One compiled reader per shape is kept in _READERS.
+    None if Numba isn't installed: fall back to NumPy fancy indexing.
+    """
+    key = (nx, ny, zerocols, stride)
+    if key in _READERS:
+        return _READERS[key]
+
+    try:
+        from numba import njit, prange  # slow to import, so only on first use
+    except ImportError:
+        _READERS[key] = None
+        return None
+
+    ncol = nx + zerocols
+    itick = ncol * ny  # image words before the footer
+    btick = (stride // 8 - 2) * 8  # footer bytes before the tick
+
+    @njit(parallel=True, cache=True)
+    def read(buf, ifrm, imgs, ticks):
+        nw = 8 // buf.itemsize  # words per uint64 tick
+        off = itick + btick // buf.itemsize
+        for j in prange(ifrm.size):
+            i = ifrm[j]
+            for y in range(ny):
+                for x in range(nx):
+                    imgs[j, y, x] = buf[i, y * ncol + x]
+            t = np.uint64(0)
+            for k in range(nw):  # little endian
+                t |= np.uint64(buf[i, off + k]) << np.uint64(8 * buf.itemsize * k)
+            ticks[j] = t
+
+    _READERS[key] = read
+    return read
+
+
+def make_tick_reader(P: dict, zerocols: int = 0):
+    """
+    returns function reading the first FPGA tick of a spool file.
+    Frame layout is computed once here, so reading thousands of files (tickfile)
+    does no per-file dict lookups or format branching.
+    """
+    if P["bpp"] not in (16, 32):
+        raise NotImplementedError("unknown spool format")
+
+    rdtype = _spooldtype(P, np.uint16 if P["bpp"] == 16 else np.uint32, zerocols)
+    if rdtype.itemsize != P["framebytes"]:
+        raise IOError("spool file may be read incorrectly--wrong framebytes")
+    off = _tick_offset(P, zerocols)
+    local = threading.local()  # one reusable buffer per tickfile() worker thread
+
+    def read_tick(fn: Path) -> int:
+        buf = getattr(local, "buf", None)
+        if buf is None:
+            buf = local.buf = bytearray(TICK.size)
+
+        # no stat of each file: a file too short to hold the first tick fails the read
+        with open(fn, "rb", buffering=0) as f:
+            f.seek(off)
+            if f.readinto(buf) != TICK.size:
+                raise IOError(f"{fn} may be read incorrectly -- could not read tick")
+
+        return TICK.unpack(buf)[0]
+
+    return read_tick
+
+
+def readNeoSpool(
+    fn: Path, P: dict, ifrm=None, tickonly: bool = False, zerocols: int = 0, reduce: str = None
+):
     """
     for 2012-present Neo/Zyla sCMOS Andor Solis spool files.
     reads a SINGLE spool file and returns the image frames & FPGA ticks
@@ -168,11 +309,17 @@ def readNeoSpool(fn: Path, P: dict, ifrm=None, tickonly: bool = False, zerocols:
     ifrm: None (read all .dat frames), int (read single frame),  list/tuple/range/ndarray (read subset of frames)
     tickonly: for speed, only read tick (used heavily to create master time index)
     zerocols: some spool formats had whole columns of zeros
+    reduce: "mean" returns the mean image of the frames, streaming one frame at a time
 
     output:
-    imgs: Nimg,x,y 3-D ndarray image stack
+    imgs: Nimg,x,y 3-D ndarray image stack (y,x float mean image if reduce="mean")
     ticks: raw FPGA tick indices of "imgs"
     tsec: elapsed time of frames start (sec)
+
+    When all frames are read (ifrm=None), blank frames at the end of the file are dropped,
+    so there may be fewer than P["nframefile"] frames. imgs and ticks are then read-only
+    views of the memory-mapped spool file; use .copy() if they need to be modified.
+    An explicit ifrm returns exactly the frames asked for.
     """
     assert fn.suffix == ".dat", "Need a spool file, you gave {fn}"
     # %% parse header
@@ -181,13 +328,8 @@ def readNeoSpool(fn: Path, P: dict, ifrm=None, tickonly: bool = False, zerocols:
 
     if P["bpp"] == 16:  # 2013-2015ish
         dtype = np.uint16  # type: ignore
-        if zerocols > 0:
-            xslice = slice(None, -zerocols)
-        else:
-            xslice = slice(None)
     elif P["bpp"] == 32:  # 2016-present
         dtype = np.uint32  # type: ignore
-        xslice = slice(None)
     else:
         raise NotImplementedError("unknown spool format")
 
@@ -196,56 +338,73 @@ def readNeoSpool(fn: Path, P: dict, ifrm=None, tickonly: bool = False, zerocols:
     if not P["framebytes"] == (npixframe * P["bpp"] // 8) + P["stride"]:
         raise IOError(f"{fn} may be read incorrectly--wrong framebytes")
 
+    # %% tick only jump
+    if tickonly:
+        return make_tick_reader(P, zerocols)(fn)
+
     filebytes = fn.stat().st_size
     if P["nframefile"] != filebytes // P["framebytes"]:
         raise IOError(f"{fn} may be read incorrectly -- wrong # of frames/file")
-    # %% tick only jump
-    if tickonly:
-        with fn.open("rb") as f:
-            f.seek(npixframe * dtype(0).itemsize, 0)
-            tick = np.fromfile(f, dtype=np.uint64, count=P["stride"] // 8)[-2]
-            return tick
     # %% read this spool file
-    if ifrm is None:
-        ifrm = range(P["nframefile"])
-    elif isinstance(ifrm, (int, np.int64)):
-        ifrm = [ifrm]
+    # %% map file: frames & footers are strided views, paged in by the kernel only as touched
+    rec = np.memmap(fn, dtype=_spooldtype(P, dtype, zerocols), mode="r", shape=P["nframefile"])
+    pix = rec["img"]["pix"]  # Nframe, ny, nx: the zero columns are skipped by the dtype
 
-    imgs = np.empty((len(ifrm), ny, nx), dtype=dtype)
-    ticks = np.zeros(len(ifrm), dtype=np.uint64)
+    allframes = ifrm is None
+    if allframes:  # remove blank images Solis throws at the end sometimes
+        ifrm = np.arange(_nframe_good(pix))
+    else:
+        ifrm = np.atleast_1d(np.asarray(ifrm, dtype=np.int64))
+        # the Numba reader does no bounds checks
+        nframe = P["nframefile"]
+        if ((ifrm < -nframe) | (ifrm >= nframe)).any():
+            raise IndexError(f"{fn} has {nframe} frames, requested frames {ifrm}")
+        ifrm %= nframe  # negative index counts from the end
 
     if "kinetic" in P and P["kinetic"] is not None:
-        tsec = np.empty(P["nframefile"])
         toffs = P["nfile"] * P["nframefile"] * P["kinetic"]
+        tsec = np.arange(len(ifrm)) * P["kinetic"] + toffs
     else:
         tsec = None
 
-    bytesperframe = npixframe * dtype(0).itemsize + P["stride"] // 8 * np.uint64(0).itemsize
-    assert bytesperframe == P["framebytes"]
-    with fn.open("rb") as f:
-        j = 0
+    if reduce == "mean":
+        # accumulate frame by frame, instead of holding the whole stack
+        acc = np.zeros((ny, nx), dtype=_accdtype(dtype))
         for i in ifrm:
-            f.seek(i * bytesperframe, 0)
-
-            img = np.fromfile(f, dtype=dtype, count=npixframe).reshape((ny, nx + zerocols))
-
-            #            if (img==0).all():  # old < ~2010 Solis spool file is over
-            #                break
-
-            imgs[j, ...] = img[:, xslice]
-            # %% get FPGA ticks value (propto elapsed time)
-            # NOTE see ../Matlab/parseNeoHeader.m for other numbers, which are probably useless. Use struct.unpack() with them
-            ticks[j] = np.fromfile(f, dtype=np.uint64, count=P["stride"] // 8)[-2]
+            acc += pix[i]
+
+        return acc / max(len(ifrm), 1), rec["hdr"][ifrm, -2], tsec
+    elif reduce is not None:
+        raise ValueError(f"unknown reduction {reduce}")
+
+    # %% get FPGA ticks value (propto elapsed time)
+    # NOTE see ../Matlab/parseNeoHeader.m for other numbers, which are probably useless. Use struct.unpack() with them
+    extract = None if allframes else make_reader(nx, ny, zerocols, P["stride"])
+    if allframes:  # zero copy
+        imgs = pix[: ifrm.size]
+        ticks = rec["hdr"][: ifrm.size, -2]
+    elif extract is not None:
+        imgs = np.empty((ifrm.size, ny, nx), dtype=dtype)
+        ticks = np.empty(ifrm.size, dtype=np.uint64)
+        extract(rec.view(dtype).reshape(rec.size, -1), ifrm, imgs, ticks)
+    else:
+        # one gather, already contiguous, without the zero columns
+        imgs = pix[ifrm]
+        ticks = rec["hdr"][ifrm, -2]
 
-            if tsec is not None:
-                tsec[j] = j * P["kinetic"] + toffs
+    return imgs, ticks, tsec
 
-            j += 1
 
-    imgs = imgs[:j, ...]  # remove blank images Solis throws at the end sometimes.
-    ticks = ticks[:j]
+def _nframe_good(img: np.ndarray) -> int:
+    """
+    number of frames up to the last non-blank frame.
+    Walks back from the end, so only the trailing blank frames are paged in.
+    """
+    j = img.shape[0]
+    while j > 0 and not img[j - 1].any():
+        j -= 1
 
-    return imgs, ticks, tsec
+    return j
 
 
 def tickfile(flist: list[Path], P: dict, outfn: Path, zerocol: int) -> pandas.Series:
@@ -254,17 +413,21 @@ def tickfile(flist: list[Path], P: dict, outfn: Path, zerocol: int) -> pandas.Se
 
     Because this is a time-expensive process, checks first to see if spool index exists, and
     will abort if it already exists.
+
+    Whether read by io_uring or threads, each file need only hold its first FPGA tick:
+    IOError if the tick read is short. Frames per file are not checked here.
     """
 
-    def _writeh5(F, outfn, flist):
+    import h5py
+
+    def _writeh5(ticks, names, path, outfn):
         print(f"writing {outfn}")
 
-        with h5py.File(outfn, "w") as f:
-            f["ticks"] = F.index
-            f["path"] = str(flist[0].parent)
-            # http://docs.h5py.org/en/latest/strings.html
-            f.create_dataset("fn", (F.size,), fletcher32=True, dtype=h5py.special_dtype(vlen=str))
-            f["fn"][:] = F.values
+        with h5py.File(outfn, "w", libver="latest") as f:
+            # small 1-D index: contiguous, no filters
+            f.create_dataset("ticks", data=ticks, chunks=None)
+            f.create_dataset("fn", data=names, chunks=None)
+            f["path"] = path
         # %% verify tick file writing
         print(f"attempting tickfile size verification {outfn}")
         if outfn.stat().st_size == 0:
@@ -272,11 +435,11 @@ def tickfile(flist: list[Path], P: dict, outfn: Path, zerocol: int) -> pandas.Se
 
         print("tickfile size is > 0")
         with h5py.File(outfn, "r") as f:
-            assert f["ticks"].size == F.index.size
+            assert f["ticks"].size == ticks.size
             print("verified ticks size")
-            assert f["path"][()] == str(flist[0].parent)
+            assert f["path"].asstr()[()] == path
             print("verified path")
-            assert f["fn"].size == F.size
+            assert f["fn"].size == names.size
             print("verified file list")
 
     # %% input checking
@@ -296,38 +459,157 @@ def tickfile(flist: list[Path], P: dict, outfn: Path, zerocol: int) -> pandas.Se
     logging.debug("ordering randomly named spool files vs. time (ticks)")
 
     tic = time()
-    ticks = np.empty(len(flist), dtype=np.int64)  # must be int64, not int for Windows in general.
-    for i, f in enumerate(flist):
-        ticks[i] = readNeoSpool(f, P, 0, True, zerocol)
-        if not i % 100:
-            print(f"\r{i/len(flist)*100:.1f} %", end="")
-
-    F = pandas.Series(index=ticks, data=[f.name for f in flist])
-    F.sort_index(inplace=True)
+    ticks = None
+    if len(flist) >= 32 and find_spec("liburing") is not None:
+        ticks = _batch_read_ticks(flist, P, zerocol)  # None if io_uring unusable here
+    if ticks is None:
+        # must be int64, not int for Windows in general.
+        ticks = np.empty(len(flist), dtype=np.int64)
+        # reads are I/O bound and release the GIL, so threads overlap them
+        reader = make_tick_reader(P, zerocol)
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(flist)))) as ex:
+            for i, tick in enumerate(ex.map(reader, flist)):
+                ticks[i] = tick
+                if not i % 100:
+                    print(f"\r{i/len(flist)*100:.1f} %", end="")
+
+    order = np.argsort(ticks, kind="stable")
+    ticks = ticks[order]
+    names = [flist[i].name for i in order]
     print(f"sorted {len(flist)} files vs. time ticks in {time()-tic:.1f} seconds")
 
     # %% writing HDF5 index
+    # variable-length UTF-8: Solis names are ASCII, but user-renamed files may not be
+    args = (ticks, np.array(names, dtype=h5py.string_dtype()), str(flist[0].parent))
     try:
-        _writeh5(F, outfn, flist)
+        _writeh5(*args, outfn)
     except (IOError, OSError) as e:
         # use a unique filename in same directory
         logging.error(f"{e}")
         outfn = Path(mkstemp(".h5", "index", dir=outfn.parent)[1])  # type: ignore
-        _writeh5(F, outfn, flist)
+        _writeh5(*args, outfn)
 
     print("wrote and verified", outfn)
 
-    return F
+    from pandas import Series  # only needed here, slow to import: pip install dmcutils[index]
+
+    return Series(index=ticks, data=names)
+
+
+def _tick_offset(P: dict, zerocols: int = 0) -> int:
+    """
+    byte offset of the FPGA tick of the first frame in a spool file
+    """
+    npixframe = (P["superx"] + zerocols) * P["supery"]
+
+    return npixframe * P["bpp"] // 8 + (P["stride"] // 8 - 2) * 8
+
+
+def _uring_reap(ring, cqe, nwait: int, nslot: int) -> list[int]:
+    """
+    wait for nwait completions, returning the result of each indexed by user_data:
+    bytes/fd if >= 0, else -errno as in C.
+    One CQE at a time: cqe[k] does not wrap around the end of the CQ ring.
+    """
+    import liburing
+
+    res = [0] * nslot
+
+    for _ in range(nwait):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        c = cqe[0]
+        try:
+            res[c.user_data] = c.res
+        except OSError as e:  # some liburing versions raise instead of returning -errno
+            res[c.user_data] = -(e.errno or 1)
+        liburing.io_uring_cqe_seen(ring, c)
+
+    return res
+
+
+def _batch_read_ticks(flist: list[Path], P: dict, zerocols: int = 0) -> np.ndarray | None:
+    """
+    read first FPGA tick of each spool file using io_uring.
+    Each file is a linked open -> read -> close chain on a registered (direct) file slot,
+    so the read skips the kernel fd table, and RING_DEPTH files cost one io_uring_enter().
+
+    None if io_uring isn't usable: disabled by seccomp/container policy, or a kernel
+    without sparse file registration / direct open (< 5.19)
+    """
+    import liburing as L
+
+    off = _tick_offset(P, zerocols)
+    ticks = np.empty(len(flist), dtype=np.int64)  # must be int64, not int for Windows in general.
+    bufs = [bytearray(TICK.size) for _ in range(RING_DEPTH)]  # reused for each batch
+
+    ring = L.Ring()
+    cqe = L.Cqe()
+    try:
+        L.io_uring_queue_init(4 * RING_DEPTH, ring)
+    except OSError as e:
+        logging.info(f"io_uring not available, reading ticks with threads: {e}")
+        return None
+    try:
+        try:
+            L.io_uring_register_files_sparse(ring, RING_DEPTH)
+        except OSError as e:
+            logging.info(f"io_uring file registration not available: {e}")
+            return None
+        for i0 in range(0, len(flist), RING_DEPTH):
+            batch = flist[i0 : i0 + RING_DEPTH]
+            N = len(batch)
+            # user_data 3j is the open, 3j+1 the read, 3j+2 the close of file slot j
+            for j, fn in enumerate(batch):
+                sqe = L.io_uring_get_sqe(ring)
+                L.io_uring_prep_open_direct(sqe, str(fn), file_index=j)
+                sqe.flags |= L.IOSQE_IO_LINK  # read is cancelled if open fails
+                sqe.user_data = 3 * j
+
+                sqe = L.io_uring_get_sqe(ring)
+                # reads len(buf) == TICK.size bytes
+                L.io_uring_prep_read(sqe, j, bufs[j], offset=off)
+                sqe.flags |= L.IOSQE_FIXED_FILE | L.IOSQE_IO_HARDLINK  # close even if read fails
+                sqe.user_data = 3 * j + 1
+
+                sqe = L.io_uring_get_sqe(ring)
+                L.io_uring_prep_close_direct(sqe, j)
+                sqe.user_data = 3 * j + 2
+            L.io_uring_submit_and_wait(ring, 3 * N)
+            res = _uring_reap(ring, cqe, 3 * N, 3 * N)
+
+            for j, fn in enumerate(batch):
+                if res[3 * j] in NOURING:  # kernel io_uring lacks direct open
+                    logging.info(f"io_uring direct open not available: {os.strerror(-res[3 * j])}")
+                    return None
+                if res[3 * j] < 0:
+                    raise OSError(-res[3 * j], os.strerror(-res[3 * j]), str(fn))
+                if res[3 * j + 1] != TICK.size:
+                    raise IOError(f"{fn} may be read incorrectly -- could not read tick")
+                ticks[i0 + j] = TICK.unpack(bufs[j])[0]
+
+            print(f"\r{(i0+N)/len(flist)*100:.1f} %", end="")
+    finally:
+        L.io_uring_queue_exit(ring)
+
+    return ticks
 
 
 def annowrite(img, newfn: Path, pngfn: Path):
     pngfn = Path(pngfn).expanduser()
     pngfn.parent.mkdir(parents=True, exist_ok=True)
 
+    if not hasattr(annowrite, "_cv2"):  # import (or fail to) once, cv2 is slow to import
+        try:
+            import cv2
+        except ImportError:
+            cv2 = None  # fall back to imageio, no time annotation
+        annowrite._cv2 = cv2  # type: ignore
+    cv2 = annowrite._cv2  # type: ignore
+
     if cv2 is not None:
         cv2.putText(
             img,
-            text=datetime.fromtimestamp(newfn.stat().st_mtime, tz=UTC).isoformat(),
+            text=datetime.fromtimestamp(newfn.stat().st_mtime, tz=timezone.utc).isoformat(),
             org=(3, 35),
             fontFace=cv2.FONT_HERSHEY_SIMPLEX,
             fontScale=1.1,
@@ -337,20 +619,81 @@ def annowrite(img, newfn: Path, pngfn: Path):
         # %% write to disk
         cv2.imwrite(str(pngfn), img)  # if using color, remember opencv requires BGR color order
     else:
+        import imageio
+
         imageio.imwrite(pngfn, img)
 
 
 # %%
 
 
-def oldspool(path: Path, xy: tuple[int, int], bn, kineticsec: float, startutc, outfn: Path):
+def _filters(bitshuffle: bool = False) -> dict[str, Any]:
     """
-    Matlab Engine import can screw up sometimes, better to import only when truly needed.
+    HDF5 compression: Blosc-LZ4 + byte shuffle if hdf5plugin is present, else gzip.
+    bitshuffle: for counters, whose high bytes rarely change
     """
     try:
-        import matlab.engine
+        import hdf5plugin
     except ImportError:
-        matlab = None
+        return {"compression": "gzip", "compression_opts": 4, "shuffle": True}
+
+    if bitshuffle:
+        return hdf5plugin.Bitshuffle(cname="lz4")
+
+    return hdf5plugin.Blosc(cname="lz4", clevel=5, shuffle=hdf5plugin.Blosc.SHUFFLE)
+
+
+def _setupimgh5(fh5: h5py.File, nframe: int, ny: int, nx: int, dtype=np.uint16) -> h5py.Dataset:
+    """
+    /rawimg image stack, compressed by _filters()
+    IMAGE attributes enable the video player in HDF5 viewers so equipped.
+    """
+    h = fh5.create_dataset(
+        "/rawimg", shape=(nframe, ny, nx), dtype=dtype, chunks=(1, ny, nx), **_filters()
+    )  # one chunk per frame: each per-frame write compresses exactly one chunk
+    h.attrs["CLASS"] = np.bytes_("IMAGE")
+    h.attrs["IMAGE_VERSION"] = np.bytes_("1.2")
+    h.attrs["IMAGE_SUBCLASS"] = np.bytes_("IMAGE_GRAYSCALE")
+    h.attrs["DISPLAY_ORIGIN"] = np.bytes_("LL")
+    h.attrs["IMAGE_WHITE_IS_ZERO"] = np.uint8(0)
+
+    return h
+
+
+def readNeoPacked12bit(fn: Path, nx: int, ny: int) -> np.ndarray:
+    """
+    "damaged" 12-bit packed Neo file from 2008 beta version of Andor Solis,
+    one frame per file. Each 3 bytes hold two pixels: even columns are read
+    big-endian, odd columns little-endian (endian-flipping by Bob Marshall, Stanford U.)
+    NumPy port of Matlab/readNeoPacked12bit.m
+    """
+    if nx % 2:
+        raise ValueError("12-bit packing requires an even number of columns")
+
+    npack = nx * ny // 2
+    raw = np.fromfile(fn, dtype=np.uint8, count=3 * npack)
+    if raw.size != 3 * npack:
+        raise IOError(f"{fn} is smaller than one {nx}x{ny} 12-bit frame")
+
+    b = raw.reshape(npack, 3).astype(np.uint16)
+
+    img = np.empty((npack, 2), dtype=np.uint16)
+    img[:, 0] = (b[:, 0] << 4) | (b[:, 1] >> 4)  # big-endian
+    img[:, 1] = (b[:, 1] >> 4) | (b[:, 2] << 4)  # little-endian
+
+    return img.reshape(ny, nx)
+
+
+def _decode_file(fn: Path, nx: int, ny: int) -> np.ndarray | None:
+    """worker process: unpack one old 12-bit file, None if it is damaged"""
+    try:
+        return readNeoPacked12bit(fn, nx, ny)
+    except IOError as e:
+        logging.critical(e)
+        return None
+
+
+def oldspool(path: Path, xy: tuple[int, int], bn, kineticsec: float, startutc, outfn: Path):
     """
     for old 2011 solis with defects 12 bit, big endian, little endian alternating
     """
@@ -363,7 +706,7 @@ def oldspool(path: Path, xy: tuple[int, int], bn, kineticsec: float, startutc, o
     if path.is_file():
         flist = [path]
     elif path.is_dir():
-        flist = sorted(path.glob("*.dat"))
+        flist = [Path(e.path) for e in _spoolfiles(path)]
     else:
         raise FileNotFoundError(f"no files found  {path}")
 
@@ -372,39 +715,42 @@ def oldspool(path: Path, xy: tuple[int, int], bn, kineticsec: float, startutc, o
         raise FileNotFoundError(f"no files found  {path}")
 
     print(f"Found {nfile} .dat files in {path}")
-    # %% use matlab to unpack corrupt file
-    if matlab:
-        print("starting Matlab")
-        eng = matlab.engine.start_matlab("-nojvm")  # nojvm makes vastly faster, disables plots
-    else:
-        raise ImportError(
-            "matlab engine not yet setup. see\n https://scivision.dev/matlab-engine-callable-from-python-how-to-install-and-setup/"
-        )
 
-    try:
-        nx, ny = xy[0] // bn[0], xy[1] // bn[1]
-
-        with h5py.File(outfn, "w", libver="latest") as fh5:
-            fimg = setupimgh5(fh5, nfile, ny, nx)
-
-            for i, f in enumerate(
-                flist
-            ):  # these old spool files were named sequentially... not so since 2012 or so!
-                print(f"processing {f}   {i+1} / {nfile}")
-                try:
-                    datmat = eng.readNeoPacked12bit(str(f), nx, ny)
-                    assert datmat.size == (ny, nx)
-                    fimg[
-                        i, ...
-                    ] = datmat  # slow due to implicit casting from Matlab array to Numpy array--only way to do it.
-                except AssertionError as e:
-                    logging.critical(f"matlab returned improper size array {e}")
-                except Exception as e:
-                    logging.critical(f"matlab had a problem on frame {i}   {e}")
-    finally:
-        eng.quit()
+    import h5py
+    from histutils.timedmc import frame2ut1
+
+    nx, ny = xy[0] // bn[0], xy[1] // bn[1]
+
+    # keep a handful of frame chunks in the HDF5 chunk cache
+    with h5py.File(
+        outfn, "w", libver="latest", rdcc_nbytes=16 * ny * nx * np.dtype(np.uint16).itemsize
+    ) as fh5:
+        fimg = _setupimgh5(fh5, nfile, ny, nx)
+        # decode in parallel, h5py writes stay in this one process. map() keeps file order:
+        # these old spool files were named sequentially... not so since 2012 or so!
+        # spawn: forking a process that already runs HDF5/thread pools can deadlock.
+        # A single file is decoded here, without starting worker interpreters.
+        decode = partial(_decode_file, nx=nx, ny=ny)
+        ex = None
+        if nfile > 1:
+            ex = ProcessPoolExecutor(min(os.cpu_count() or 1, nfile), get_context("spawn"))
+        try:
+            for i, img in enumerate(ex.map(decode, flist) if ex else map(decode, flist)):
+                print(f"processing {flist[i]}   {i+1} / {nfile}")
+                if img is not None:
+                    fimg[i, ...] = img
+        finally:
+            if ex is not None:
+                ex.shutdown()
+
+        rawind = np.arange(nfile, dtype=np.int64) + 1
+        # 1-D column beside the frames, as histutils.vid2h5 lays it out, but bitshuffled.
+        # These old files have no FPGA tick footer; this frame counter is the only index.
+        find = fh5.create_dataset(
+            "/rawind", data=rawind, chunks=(min(nfile, 4096),), **_filters(bitshuffle=True)
+        )
+        find.attrs["units"] = "one-based index since camera program started this session"
 
-    rawind = np.arange(nfile) + 1
     ut1 = frame2ut1(startutc, kineticsec, rawind)
 
     return rawind, ut1
@@ -1,11 +1,35 @@
 #!/usr/bin/env python
+import os
 import pytest
 from pathlib import Path
+import numpy as np
+import dmcutils
 import dmcutils.neospool as neo
 
-rdir = Path(__file__).parents[1]
+rdir = Path(__file__).parents[3]
 inifn = rdir / "data" / "spool" / "acquisitionmetadata.ini"
 
+P = {"superx": 8, "supery": 4, "nframefile": 3, "stride": 24, "framebytes": 88, "bpp": 16}
+
+
+def writespool(fn: Path, P: dict, ticks, zerocols: int = 0) -> np.ndarray:
+    """write a synthetic spool file, returning the image stack without zero columns"""
+    nx, ny = P["superx"], P["supery"]
+    rng = np.random.default_rng(len(fn.name))
+
+    imgs = rng.integers(1, 4096, (P["nframefile"], ny, nx + zerocols), dtype=np.uint16)
+    if zerocols:
+        imgs[..., -zerocols:] = 0
+    hdr = np.zeros((P["nframefile"], P["stride"] // 8), dtype=np.uint64)
+    hdr[:, -2] = ticks
+
+    with fn.open("wb") as f:
+        for img, h in zip(imgs, hdr):
+            f.write(img.tobytes())
+            f.write(h.tobytes())
+
+    return imgs[..., :nx]
+
 
 def test_neoparam():
     param = neo.spoolparam(inifn)
@@ -16,6 +40,212 @@ def test_neoparam():
     assert param["framebytes"] == 416016
     assert param["bpp"] == 16
 
+    hits = neo._parse_ini_cached.cache_info().hits
+    assert neo.spoolparam(inifn) == param
+    assert neo._parse_ini_cached.cache_info().hits == hits + 1
+
+
+@pytest.mark.parametrize("zerocols", [0, 2])
+def test_readspool(tmp_path, zerocols):
+    Z = {**P, "framebytes": P["framebytes"] + 2 * zerocols * P["supery"]}
+    fn = tmp_path / "0000000000spool.dat"
+    ref = writespool(fn, Z, [101, 102, 103], zerocols)
+
+    imgs, ticks, tsec = neo.readNeoSpool(fn, Z, zerocols=zerocols)
+    assert (imgs == ref).all()
+    assert ticks.tolist() == [101, 102, 103]
+    assert tsec is None
+    # frames and ticks are separate views of the spool file: nothing is copied until used
+    assert isinstance(imgs, np.memmap) and not imgs.flags.owndata
+    assert isinstance(ticks, np.memmap) and not ticks.flags.owndata
+
+    imgs, ticks, tsec = neo.readNeoSpool(fn, Z, 1, zerocols=zerocols)
+    assert imgs.shape == (1, P["supery"], P["superx"])
+    assert (imgs[0] == ref[1]).all()
+    assert ticks.tolist() == [102]
+    assert neo.make_reader(8, 4, zerocols, 24) is neo.make_reader(8, 4, zerocols, 24)
+
+    imgs, ticks, tsec = neo.readNeoSpool(fn, Z, -1, zerocols=zerocols)
+    assert ticks.tolist() == [103]
+    for bad in (3, -4, 1000000):
+        with pytest.raises(IndexError):
+            neo.readNeoSpool(fn, Z, bad, zerocols=zerocols)
+
+    assert neo.readNeoSpool(fn, Z, 0, True, zerocols) == 101
+
+    fmean, ticks, tsec = neo.readNeoSpool(fn, Z, zerocols=zerocols, reduce="mean")
+    assert np.allclose(fmean, ref.mean(axis=0))
+    assert ticks.tolist() == [101, 102, 103]
+
+
+def test_blankframes(tmp_path):
+    fn = tmp_path / "0000000000spool.dat"
+    ref = writespool(fn, P, [1, 2, 3])
+    with fn.open("r+b") as f:  # zero last frame image
+        f.seek(2 * P["framebytes"])
+        f.write(bytes(P["superx"] * P["supery"] * 2))
+
+    imgs, ticks, tsec = neo.readNeoSpool(fn, P)
+    assert (imgs == ref[:2]).all()
+    assert ticks.tolist() == [1, 2]
+
+    fmean, ticks, tsec = neo.readNeoSpool(fn, P, reduce="mean")
+    assert np.allclose(fmean, ref[:2].mean(axis=0))
+    assert ticks.tolist() == [1, 2]
+
+    imgs, ticks, tsec = neo.readNeoSpool(fn, P, [0, 2])  # explicit frames are kept
+    assert imgs.shape[0] == 2 and not imgs[1].any()
+    assert ticks.tolist() == [1, 3]
+
+
+@pytest.mark.parametrize("N", [5, 40])
+def test_tickfile(tmp_path, N):
+    start = np.random.default_rng(N).permutation(N) * 1000 + 1
+    flist = []
+    for i, t in enumerate(start):
+        fn = tmp_path / f"{i:010d}spöol.dat"  # non-ASCII names are kept
+        writespool(fn, P, t + np.arange(P["nframefile"]))
+        flist.append(fn)
+
+    F = neo.tickfile(flist, P, tmp_path / "index.h5", 0)
+
+    assert (F.index == np.sort(start)).all()
+    assert list(F.values) == [flist[i].name for i in np.argsort(start)]
+    assert neo.spoolpath(tmp_path / "index.h5") == [tmp_path / n for n in F.values]
+
+    flist[1].write_bytes(flist[1].read_bytes()[:10])  # still being written
+    with pytest.raises(IOError):
+        neo.tickfile(flist, P, tmp_path / "index2.h5", 0)
+
+
+def test_mean16to8():
+    img = np.arange(4 * 50 * 60, dtype=np.uint16).reshape(4, 50, 60)
+
+    f8 = dmcutils.mean16to8(img)
+    assert f8.dtype == np.uint8
+    assert f8.shape == (50, 60)
+    assert f8[0, 0] == 0 and f8[-1, -1] == 255
+    assert (np.diff(f8.ravel().astype(int)) >= 0).all()
+
+    assert (dmcutils.mean16to8(img.mean(axis=0)) == f8).all()
+
+    big = np.random.default_rng(0).integers(0, 4096, (3, 120, 100), dtype=np.uint16)
+    assert (
+        abs(dmcutils.mean16to8(big).astype(int) - dmcutils.mean16to8(big.mean(axis=0))) <= 2
+    ).all()
+
+    wide = np.array([[[2**24 + 1]], [[2**24 + 3]]], dtype=np.uint32)  # Mono32 needs float64
+    assert dmcutils._accdtype(wide.dtype) is np.float64
+    assert (wide.sum(axis=0, dtype=dmcutils._accdtype(wide.dtype)) == [[2**25 + 4]]).all()
+
+    x = np.random.default_rng(0).random(1001, dtype=np.float32)
+    assert np.allclose(dmcutils._percentile(x, (0.5, 99.5)), np.percentile(x, (0.5, 99.5)))
+    assert (dmcutils.bytescale(np.ones((3, 3)), (1, 1)) == 0).all()
+    f = np.full((2, 2), 3.0, dtype=np.float32)
+    assert (dmcutils.bytescale(f, (1, 5)) == 127).all() and (f == 3.0).all()  # input unchanged
+
+
+def test_findnewest(tmp_path):
+    for i in range(3):
+        fn = tmp_path / f"{i:010d}spool.dat"
+        fn.touch()
+        os.utime(fn, (i, i))
+    (tmp_path / "acquisitionmetadata.ini").touch()
+
+    assert neo.spoolpath(tmp_path) == [tmp_path / f"{i:010d}spool.dat" for i in range(3)]
+
+    newest, fset = neo.findnewest(tmp_path)
+    assert newest == tmp_path / "0000000002spool.dat"
+    assert len(fset) == 3
+
+    assert neo.findnewest(tmp_path, fset) == (None, set())
+
+
+def test_batch_ticks(tmp_path):
+    pytest.importorskip("liburing")
+
+    rng = np.random.default_rng(0)
+    # > 2 batches, so completions wrap around the end of the CQ ring
+    start = rng.permutation(3 * neo.RING_DEPTH + 10) * 1000 + 1
+    flist = []
+    for i, t in enumerate(start):
+        fn = tmp_path / f"{i:010d}spool.dat"
+        writespool(fn, P, t + np.arange(P["nframefile"]))
+        flist.append(fn)
+
+    ticks = neo._batch_read_ticks(flist, P)
+
+    assert (ticks == start).all()
+    assert ticks[0] == neo.readNeoSpool(flist[0], P, 0, True)
+
+    flist[5] = tmp_path / "nothere.dat"
+    with pytest.raises(FileNotFoundError) as e:
+        neo._batch_read_ticks(flist, P)
+    assert e.value.filename == str(flist[5])
+
+
+def test_nouring(tmp_path, monkeypatch):
+    """io_uring disabled at run time, e.g. by seccomp: tickfile falls back to threads"""
+    liburing = pytest.importorskip("liburing")
+
+    def noring(*args):
+        raise PermissionError(1, "Operation not permitted")
+
+    monkeypatch.setattr(liburing, "io_uring_queue_init", noring)
+
+    flist = []
+    for i in range(40):
+        fn = tmp_path / f"{i:010d}spool.dat"
+        writespool(fn, P, 1000 * (40 - i) + np.arange(P["nframefile"]))
+        flist.append(fn)
+
+    assert neo._batch_read_ticks(flist, P) is None
+    F = neo.tickfile(flist, P, tmp_path / "index.h5", 0)
+    assert list(F.values) == [f.name for f in flist[::-1]]
+
+
+def test_setupimgh5(tmp_path):
+    import h5py
+
+    img = np.arange(3 * 4 * 8, dtype=np.uint16).reshape(3, 4, 8)
+
+    with h5py.File(tmp_path / "raw.h5", "w", libver="latest") as f:
+        h = neo._setupimgh5(f, *img.shape)
+        h[...] = img
+        assert h.chunks == (1, 4, 8)
+        assert h.attrs["CLASS"] == b"IMAGE"
+
+    with h5py.File(tmp_path / "raw.h5", "r") as f:
+        assert (f["/rawimg"][:] == img).all()
+
+
+def test_packed12bit(tmp_path):
+    fn = tmp_path / "old.dat"
+    fn.write_bytes(bytes([0xAB, 0xCD, 0xEF, 0x12, 0x34, 0x56]))
+
+    img = neo.readNeoPacked12bit(fn, 2, 2)
+    assert (img == [[0xABC, 0xEFC], [0x123, 0x563]]).all()
+
+    with pytest.raises(IOError):
+        neo.readNeoPacked12bit(fn, 4, 2)
+
+    rawind, ut1 = neo.oldspool(fn, (2, 2), (1, 1), 0.1, 0.0, tmp_path / "one.h5")  # in-process
+    assert (rawind == [1]).all()
+
+    import h5py
+
+    with h5py.File(tmp_path / "one.h5", "r") as f:
+        assert (f["/rawimg"][0] == img).all()
+
+    (tmp_path / "old2.dat").write_bytes(fn.read_bytes()[::-1])
+    rawind, ut1 = neo.oldspool(tmp_path, (2, 2), (1, 1), 0.1, 0.0, tmp_path / "old.h5")
+    assert (rawind == [1, 2]).all()
+
+    with h5py.File(tmp_path / "old.h5", "r") as f:
+        assert (f["/rawimg"][0] == img).all()
+        assert (f["/rawimg"][1] == neo.readNeoPacked12bit(tmp_path / "old2.dat", 2, 2)).all()
+        assert (f["/rawind"][:] == rawind).all()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])